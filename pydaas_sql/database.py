@@ -1,8 +1,11 @@
-from typing import Type, TypeVar
+from collections import OrderedDict
+from typing import Awaitable, Callable, Sequence, TypeVar
 
 import sqlmodel as sm
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.ext.asyncio.engine import AsyncEngine, create_async_engine
-from sqlalchemy.orm import sessionmaker
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 
@@ -11,8 +14,28 @@ class Database:
         self._engine = None
         self._session_cls = None
 
-    def init(self, db_url: str, echo: bool = True):
-        self._engine = create_async_engine(db_url, echo=echo)  # type: ignore[assignment]
+    def init(
+        self,
+        db_url: str,
+        *,
+        echo: bool = False,
+        pool_size: int = 20,
+        max_overflow: int = 10,
+        statement_cache_size: int = 1024,
+    ):
+        url = make_url(db_url)
+        kwargs: dict = {"echo": echo, "pool_pre_ping": True}
+        if url.get_backend_name() != "sqlite":
+            kwargs.update(pool_size=pool_size, max_overflow=max_overflow)
+        if url.get_driver_name() == "asyncpg":
+            url = url.update_query_dict(
+                {"prepared_statement_cache_size": str(statement_cache_size)}
+            )
+            kwargs["connect_args"] = {"statement_cache_size": statement_cache_size}
+        self._engine = create_async_engine(url, **kwargs)  # type: ignore[assignment]
+        self._session_cls = async_sessionmaker(  # type: ignore[assignment]
+            self._engine, class_=AsyncSession, expire_on_commit=False
+        )
 
     @property
     def engine(self) -> AsyncEngine:
@@ -21,18 +44,18 @@ class Database:
         return self._engine
 
     @property
-    def Session(self) -> Type[AsyncSession]:
+    def Session(self) -> async_sessionmaker[AsyncSession]:
         if not self._session_cls:
-            self._session_cls = sessionmaker(
-                self.engine, class_=AsyncSession, expire_on_commit=False
-            )  # type: ignore[call-overload]
-        return self._session_cls  # type: ignore[return-value]
+            raise Exception("Database uninitialized. Call db.init(...) method")
+        return self._session_cls
 
 
 db = Database()
 
 
 class Filter:
+    __slots__ = ("_expressions",)
+
     def __init__(self, *expressions) -> None:
         self._expressions = expressions
 
@@ -48,6 +71,8 @@ class Filter:
         return Filter(sm.or_(*ors)) if ors else Filter()
 
     def apply(self, stm):
+        if not self._expressions:
+            return stm
         return stm.where(*self._expressions)
 
     def __repr__(self) -> str:
@@ -56,8 +81,13 @@ class Filter:
     def __getitem__(self, index):
         return self._expressions[index]
 
+    def __bool__(self) -> bool:
+        return bool(self._expressions)
+
 
 class Sorting:
+    __slots__ = ("_expressions",)
+
     def __init__(self, *expressions) -> None:
         self._expressions = expressions
 
@@ -68,6 +98,8 @@ class Sorting:
         return Sorting(*(*self._expressions, *(sm.desc(i) for i in expressions)))
 
     def apply(self, stm):
+        if not self._expressions:
+            return stm
         return stm.order_by(*self._expressions)
 
     def __repr__(self) -> str:
@@ -78,6 +110,8 @@ class Sorting:
 
 
 class Pagination:
+    __slots__ = ("_page", "_page_size", "_fetch_one_more")
+
     def __init__(
         self, page: int = 1, page_size: int = 20, fetch_one_more: bool = False
     ) -> None:
@@ -97,7 +131,89 @@ class Pagination:
     def apply(self, stm):
         offset = (self._page - 1) * self._page_size
         limit = self._page_size + 1 if self._fetch_one_more else self._page_size
-        return stm.offset(offset).limit(limit)
+        if offset:
+            stm = stm.offset(offset)
+        return stm.limit(limit)
 
     def __repr__(self) -> str:
         return f"Pagination{self._page, self._page_size, self._fetch_one_more}"
+
+
+class PageCache:
+    __slots__ = ("_db", "_maxsize", "_prefetch_pages", "_entries", "_versions")
+
+    _INFO_KEY = "pydaas_sql.page_caches"
+
+    def __init__(
+        self, db: AsyncSession, maxsize: int = 128, prefetch_pages: int = 5
+    ) -> None:
+        self._db = db
+        self._maxsize = max(maxsize, 1)
+        self._prefetch_pages = max(prefetch_pages, 1)
+        self._entries: OrderedDict[tuple, Sequence] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        db.info.setdefault(self._INFO_KEY, []).append(self)
+        # Commits and rollbacks may expire the cached instances, and commits can
+        # carry writes made outside DataService.
+        event.listen(db.sync_session, "after_commit", self._clear)
+        event.listen(db.sync_session, "after_rollback", self._clear)
+
+    @property
+    def db(self) -> AsyncSession:
+        return self._db
+
+    def _clear(self, *args) -> None:
+        self._entries.clear()
+
+    @classmethod
+    def invalidate(cls, db: AsyncSession, table: str) -> None:
+        for cache in db.info.get(cls._INFO_KEY, ()):
+            cache._versions[table] = cache._versions.get(table, 0) + 1
+
+    async def fetch(
+        self,
+        table: str,
+        stm,
+        pagination: Pagination,
+        loader: Callable[..., Awaitable[Sequence]],
+        readonly: bool = False,
+    ) -> Sequence:
+        page_size = pagination._page_size
+        offset = (pagination._page - 1) * page_size
+        limit = page_size + 1 if pagination._fetch_one_more else page_size
+        block_size = page_size * self._prefetch_pages
+        block_start = offset - offset % block_size
+        block_stm = stm.offset(block_start) if block_start else stm
+        block_stm = block_stm.limit(block_size + 1)
+
+        cache_key = stm._generate_cache_key()
+        if cache_key is None:
+            rows = await loader(block_stm)
+        else:
+            params = tuple(
+                tuple(v) if isinstance(v, list) else v
+                for v in (b.effective_value for b in cache_key.bindparams)
+            )
+            key = (
+                table,
+                self._versions.get(table, 0),
+                cache_key.key,
+                params,
+                readonly,
+                block_size,
+                block_start,
+            )
+            cached = self._entries.get(key)
+            if cached is None:
+                rows = await loader(block_stm)
+                self._entries[key] = rows
+                if len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+            else:
+                rows = cached
+
+        start = offset - block_start
+        return rows[start : start + limit]
+
+    def __repr__(self) -> str:
+        return f"PageCache{self._maxsize, self._prefetch_pages}"
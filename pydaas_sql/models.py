@@ -1,3 +1,4 @@
+from functools import cache
 from typing import Type
 
 from sqlmodel import Field, SQLModel
@@ -7,6 +8,7 @@ class IdModel(SQLModel):
     id: int | None = Field(None, primary_key=True)
 
 
+@cache
 def base_search(items_cls: Type[SQLModel]) -> Type[SQLModel]:
     class _BaseSearch(SQLModel):
         items: list[items_cls]  # type: ignore[valid-type]
@@ -1,10 +1,11 @@
-import asyncio
+from functools import cache
 from typing import AsyncIterator, Generic, Sequence, Type, TypeVar
 
+from sqlalchemy import bindparam, delete, insert, update
 from sqlmodel import SQLModel, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from pydaas_sql.database import Filter, Pagination, Sorting
+from pydaas_sql.database import Filter, PageCache, Pagination, Sorting
 
 T = TypeVar("T", bound=SQLModel)
 
@@ -17,6 +18,41 @@ class DataService(Generic[T]):
         assert self.Model is not None, "DataService.Model is required"
         self.db = db
 
+    @classmethod
+    @cache
+    def _field_names(cls) -> frozenset[str]:
+        return frozenset(cls.Model.model_fields)
+
+    @classmethod
+    @cache
+    def _table_name(cls) -> str:
+        return cls.Model.__table__.name  # type: ignore[attr-defined]
+
+    @classmethod
+    @cache
+    def _base_select(cls):
+        return select(cls.Model)
+
+    @classmethod
+    @cache
+    def _pk_columns(cls) -> tuple:
+        return tuple(cls.Model.__table__.primary_key.columns)  # type: ignore[attr-defined]
+
+    @classmethod
+    @cache
+    def _pk_select(cls):
+        return cls._base_select().where(
+            *(col == bindparam(f"pk_{col.name}") for col in cls._pk_columns())
+        )
+
+    def _pk_params(self, id) -> dict:
+        id = [id] if not isinstance(id, (tuple, list)) else id
+        return {f"pk_{col.name}": id[i] for i, col in enumerate(self._pk_columns())}
+
+    def _pk_clauses(self, id) -> list:
+        id = [id] if not isinstance(id, (tuple, list)) else id
+        return [col == id[i] for i, col in enumerate(self._pk_columns())]
+
     def _create_model(self, data: SQLModel | dict) -> T:
         is_dict = isinstance(data, dict)
         return (
@@ -25,55 +61,95 @@ class DataService(Generic[T]):
             else self.Model(**data.model_dump(exclude_unset=True))  # type: ignore[union-attr]
         )
 
+    def _to_insert_rows(self, values: list[SQLModel | dict]) -> list[dict]:
+        return [
+            v if isinstance(v, dict) else v.model_dump(exclude_unset=True)
+            for v in values
+        ]
+
+    def _update_values(self, data: SQLModel | dict) -> dict:
+        values = (
+            data
+            if isinstance(data, dict)
+            else data.model_dump(exclude_unset=True, exclude_defaults=True)
+        )
+        field_names = self._field_names()
+        return {k: v for k, v in values.items() if k in field_names}
+
     def _update_model(self, instance: T, values: SQLModel | dict) -> T:
-        if not isinstance(values, dict):
-            values = values.model_dump(exclude_unset=True, exclude_defaults=True)
-        sentinel = object()
-        for field in self.Model.__fields__:  # type: ignore[attr-defined]
-            value = values.get(field, sentinel)
-            if value is not sentinel:
-                setattr(instance, field, value)
+        for field, value in self._update_values(values).items():
+            setattr(instance, field, value)
         return instance
 
-    async def _get_model_chunks(
-        self, filter: Filter | None = None, chunk_size: int = 100
-    ) -> AsyncIterator[Sequence[T]]:
-        page = 1
-        has_next = True
-        while has_next:
-            chunk = await self.search(
-                filter,
-                pagination=Pagination(page, page_size=chunk_size, fetch_one_more=True),
-            )
-            has_next = len(chunk) == chunk_size + 1
-            yield chunk[:-1] if has_next else chunk
-            page = page + 1
-
-    async def search(
+    def _search_stm(
         self,
         filter: Filter | None = None,
         sorting: Sorting | None = None,
         pagination: Pagination | None = None,
-    ) -> Sequence[T]:
-        stm = select(self.Model)
+    ):
+        stm = self._base_select()
         if filter:
             stm = filter.apply(stm)
         if sorting:
             stm = sorting.apply(stm)
         if pagination:
             stm = pagination.apply(stm)
+        return stm
 
-        res = await self.db.exec(stm)
-        return res.all()
+    async def search(
+        self,
+        filter: Filter | None = None,
+        sorting: Sorting | None = None,
+        pagination: Pagination | None = None,
+        readonly: bool = False,
+        cache: PageCache | None = None,
+    ) -> Sequence[T]:
+        use_cache = cache is not None and pagination is not None
+        stm = self._search_stm(filter, sorting, None if use_cache else pagination)
+
+        async def load(stm) -> Sequence[T]:
+            if not readonly:
+                return (await self.db.exec(stm)).all()
+            # Load through a throwaway session on self.db's own connection: no pool
+            # checkout, flushed rows stay visible, and self.db's identity map is
+            # untouched, so the rows come back detached.
+            conn = await self.db.connection()
+            async with AsyncSession(bind=conn, expire_on_commit=False) as reader:
+                return (await reader.exec(stm)).all()
+
+        if use_cache:
+            assert cache is not None and pagination is not None
+            if cache.db is not self.db:
+                raise Exception("PageCache is bound to another session")
+            return await cache.fetch(
+                self._table_name(), stm, pagination, load, readonly
+            )
+        return await load(stm)
+
+    async def iter_search(
+        self,
+        filter: Filter | None = None,
+        sorting: Sorting | None = None,
+        pagination: Pagination | None = None,
+        yield_per: int = 200,
+    ) -> AsyncIterator[T]:
+        stm = self._search_stm(filter, sorting, pagination)
+        res = await self.db.stream_scalars(stm.execution_options(yield_per=yield_per))
+        try:
+            async for item in res:
+                yield item
+        finally:
+            await res.close()
 
     async def create(self, data: SQLModel | dict) -> T:
         instance = self._create_model(data)
         self.db.add(instance)
         await self.db.commit()
+        PageCache.invalidate(self.db, self._table_name())
         return instance
 
     async def get(self, filter: Filter) -> T | None:
-        stm = select(self.Model)
+        stm = self._base_select()
         stm = filter.apply(stm)
         res = await self.db.exec(stm)
         return res.one_or_none()
@@ -82,23 +158,39 @@ class DataService(Generic[T]):
         self._update_model(instance, data)
         self.db.add(instance)
         await self.db.commit()
+        PageCache.invalidate(self.db, self._table_name())
         return instance
 
     async def delete(self, instance: T):
         await self.db.delete(instance)
+        PageCache.invalidate(self.db, self._table_name())
 
     async def get_by_id(self, id) -> T | None:
-        id = [id] if not isinstance(id, (tuple, list)) else id
-        filter = Filter()
-        for i, col in enumerate(self.Model.__table__.primary_key.columns):  # type: ignore[attr-defined]
-            filter = filter.and_(getattr(self.Model, col.name) == id[i])
-        return await self.get(filter)
+        if len(self._pk_columns()) == 1 and not isinstance(id, (tuple, list)):
+            # session.get() serves pending deletes from the identity map.
+            instance = await self.db.get(self.Model, id)
+            return None if instance in self.db.deleted else instance
+        res = await self.db.exec(self._pk_select(), params=self._pk_params(id))
+        return res.one_or_none()
 
     async def update_by_id(self, id, data: SQLModel | dict) -> T | None:
-        instance = await self.get_by_id(id)
-        if not instance:
-            return None
-        return await self.update(instance, data)
+        values = self._update_values(data)
+        if not values or not self.db.get_bind().dialect.update_returning:
+            instance = await self.get_by_id(id)
+            if not instance:
+                return None
+            return await self.update(instance, data)
+        stm = (
+            update(self.Model)
+            .where(*self._pk_clauses(id))
+            .values(**values)
+            .returning(self.Model)
+        )
+        res = await self.db.exec(stm)  # type: ignore[call-overload]
+        instance = res.scalar_one_or_none()
+        await self.db.commit()
+        PageCache.invalidate(self.db, self._table_name())
+        return instance
 
     async def delete_by_id(self, id) -> bool:
         instance = await self.get_by_id(id)
@@ -111,32 +203,48 @@ class DataService(Generic[T]):
     async def bulk_create(
         self, values: list[SQLModel | dict], chunk_size: int = 100
     ) -> int:
-        count = 0
-        for data in values:
-            instance = self._create_model(data)
-            self.db.add(instance)
-            count += 1
-            if count % chunk_size == 0:
-                await self.db.commit()
-        if count % chunk_size != 0:
-            await self.db.commit()
-        return count
+        """Insert values with one executemany INSERT per chunk, all-or-nothing.
+
+        Dict values are sent to the database as-is, without
+        ``Model.model_validate``: bad types or missing required fields surface
+        as database errors (e.g. ``IntegrityError``) instead of
+        ``ValidationError``. Rows in a chunk should share the same keys.
+        """
+        rows = self._to_insert_rows(values)
+        stm = insert(self.Model)
+        try:
+            for i in range(0, len(rows), chunk_size):
+                await self.db.exec(stm, params=rows[i : i + chunk_size])  # type: ignore[call-overload]
+        except Exception:
+            await self.db.rollback()
+            raise
+        await self.db.commit()
+        PageCache.invalidate(self.db, self._table_name())
+        return len(rows)
 
     async def bulk_update(
-        self, filter: Filter, data: SQLModel, chunk_size: int = 100
+        self, filter: Filter, data: SQLModel | dict, chunk_size: int = 100
     ) -> int:
-        count = 0
-        async for chunk in self._get_model_chunks(filter, chunk_size):
-            chunk = [self._update_model(i, data) for i in chunk]
-            self.db.add_all(chunk)
-            await self.db.commit()
-            count += len(chunk)
-        return count
+        """Run a single UPDATE ... WHERE filter and return the rowcount.
+
+        ``chunk_size`` is ignored; it is kept for backwards compatibility.
+        """
+        values = self._update_values(data)
+        if not values:
+            return 0
+        stm = filter.apply(update(self.Model).values(**values))
+        res = await self.db.exec(stm)  # type: ignore[call-overload]
+        await self.db.commit()
+        PageCache.invalidate(self.db, self._table_name())
+        return res.rowcount
 
     async def bulk_delete(self, filter: Filter, chunk_size: int = 100) -> int:
-        count = 0
-        async for chunk in self._get_model_chunks(filter, chunk_size):
-            ops = [self.delete(i) for i in chunk]
-            await asyncio.gather(*ops)
-            count += len(chunk)
-        return count
+        """Run a single DELETE ... WHERE filter and return the rowcount.
+
+        Like ``delete()``, this does not commit. ``chunk_size`` is ignored; it is
+        kept for backwards compatibility.
+        """
+        stm = filter.apply(delete(self.Model))
+        res = await self.db.exec(stm)  # type: ignore[call-overload]
+        PageCache.invalidate(self.db, self._table_name())
+        return res.rowcount
@@ -0,0 +1,22 @@
+from sqlmodel import SQLModel
+
+from pydaas_sql.models import base_search
+
+
+class ItemOut(SQLModel):
+    name: str
+
+
+class OtherOut(SQLModel):
+    name: str
+
+
+def test_base_search_is_memoized_per_items_class():
+    assert base_search(ItemOut) is base_search(ItemOut)
+    assert base_search(ItemOut) is not base_search(OtherOut)
+
+
+def test_base_search_schema():
+    page = base_search(ItemOut)(items=[ItemOut(name="a")], prev_page=None, next_page=2)
+    assert page.items[0].name == "a"  # type: ignore[attr-defined]
+    assert page.next_page == 2  # type: ignore[attr-defined]
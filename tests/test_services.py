@@ -0,0 +1,237 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Field, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from pydaas_sql.database import Database, Filter, PageCache, Pagination, Sorting
+from pydaas_sql.models import IdModel
+from pydaas_sql.services import DataService
+
+
+class Item(IdModel, table=True):
+    name: str
+    qty: int = 0
+
+
+class Pair(SQLModel, table=True):
+    a: int = Field(primary_key=True)
+    b: int = Field(primary_key=True)
+    value: str = ""
+
+
+class ItemService(DataService[Item]):
+    Model = Item
+
+
+class PairService(DataService[Pair]):
+    Model = Pair
+
+
+def with_session(test):
+    async def main(path: str):
+        database = Database()
+        database.init(f"sqlite+aiosqlite:///{path}")
+        async with database.engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        try:
+            async with database.Session() as session:
+                await test(session)
+        finally:
+            await database.engine.dispose()
+
+    def wrapper():
+        with tempfile.TemporaryDirectory() as tmp:
+            asyncio.run(main(os.path.join(tmp, "test.db")))
+
+    return wrapper
+
+
+def items(count: int) -> list[dict]:
+    return [{"name": f"item{i}", "qty": i} for i in range(1, count + 1)]
+
+
+@with_session
+async def test_bulk_create(session: AsyncSession):
+    service = ItemService(session)
+    assert await service.bulk_create(items(5), chunk_size=2) == 5
+    assert [i.name for i in await service.search()] == [i["name"] for i in items(5)]
+
+
+@with_session
+async def test_bulk_create_rolls_back_on_failure(session: AsyncSession):
+    service = ItemService(session)
+    rows = [
+        {"id": 1, "name": "a", "qty": 0},
+        {"id": 2, "name": "b", "qty": 0},
+        {"id": 1, "name": "c", "qty": 0},
+    ]
+    with pytest.raises(IntegrityError):
+        await service.bulk_create(rows, chunk_size=2)
+    assert len(await service.search()) == 0
+
+
+@with_session
+async def test_bulk_create_skips_model_validation(session: AsyncSession):
+    service = ItemService(session)
+    with pytest.raises(IntegrityError):
+        await service.bulk_create([{"qty": 1}])
+    assert len(await service.search()) == 0
+
+
+@with_session
+async def test_bulk_update(session: AsyncSession):
+    service = ItemService(session)
+    await service.bulk_create(items(3))
+    loaded = await service.get_by_id(1)
+
+    assert await service.bulk_update(Filter(Item.qty < 3), {"qty": 10}) == 2
+    assert loaded is not None and loaded.qty == 10
+    assert [i.qty for i in await service.search()] == [10, 10, 3]
+    assert await service.bulk_update(Filter(Item.qty == 0), {"qty": 1}) == 0
+
+
+@with_session
+async def test_bulk_delete(session: AsyncSession):
+    service = ItemService(session)
+    await service.bulk_create(items(3))
+
+    assert await service.bulk_delete(Filter(Item.qty > 1)) == 2
+    await session.commit()
+    assert [i.id for i in await service.search()] == [1]
+    assert await service.bulk_delete(Filter(Item.qty > 1)) == 0
+
+
+@with_session
+async def test_update_by_id(session: AsyncSession):
+    service = ItemService(session)
+    await service.bulk_create(items(2))
+
+    updated = await service.update_by_id(2, {"qty": 7})
+    assert updated is not None and updated.id == 2 and updated.qty == 7
+    assert await service.update_by_id(99, {"qty": 7}) is None
+    unchanged = await service.update_by_id(1, {})
+    assert unchanged is not None and unchanged.qty == 1
+
+
+@with_session
+async def test_update_by_id_without_update_returning(session: AsyncSession):
+    service = ItemService(session)
+    await service.bulk_create(items(2))
+    session.get_bind().dialect.update_returning = False
+
+    updated = await service.update_by_id(2, {"qty": 7})
+    assert updated is not None and updated.qty == 7
+    assert await service.update_by_id(99, {"qty": 7}) is None
+    assert not session.dirty
+
+
+@with_session
+async def test_delete_by_id(session: AsyncSession):
+    service = ItemService(session)
+    await service.bulk_create(items(2))
+
+    assert await service.delete_by_id(1) is True
+    assert await service.get_by_id(1) is None
+    assert await service.delete_by_id(1) is False
+    assert await service.delete_by_id(99) is False
+    await session.commit()
+    assert [i.id for i in await service.search()] == [2]
+
+
+@with_session
+async def test_get_by_id_composite_pk(session: AsyncSession):
+    service = PairService(session)
+    await service.bulk_create(
+        [{"a": 1, "b": 2, "value": "x"}, {"a": 2, "b": 1, "value": "y"}]
+    )
+
+    pair = await service.get_by_id((1, 2))
+    assert pair is not None and pair.value == "x"
+    pair = await service.get_by_id([2, 1])
+    assert pair is not None and pair.value == "y"
+    assert await service.get_by_id((2, 2)) is None
+
+
+@with_session
+async def test_page_cache(session: AsyncSession):
+    service = ItemService(session)
+    await service.bulk_create(items(7))
+    cache = PageCache(session, prefetch_pages=2)
+    sorting = Sorting().asc_(Item.id)
+
+    async def page_ids(page: int, fetch_one_more: bool = False, **kwargs):
+        pagination = Pagination(page, 2, fetch_one_more)
+        page_items = await service.search(
+            sorting=sorting, pagination=pagination, cache=cache, **kwargs
+        )
+        return [i.id for i in page_items]
+
+    assert await page_ids(1, fetch_one_more=True) == [1, 2, 3]
+    assert await page_ids(2, fetch_one_more=True) == [3, 4, 5]
+    assert len(cache._entries) == 1
+
+    assert await page_ids(3) == [5, 6]
+    assert len(cache._entries) == 2
+
+    await service.bulk_delete(Filter(Item.id == 7))
+    assert await page_ids(3) == [5, 6]
+    assert await page_ids(4) == []
+    assert len(cache._entries) == 3
+
+    await session.rollback()
+    assert not cache._entries
+    await service.create({"name": "item8", "qty": 8})
+    assert not cache._entries
+    assert await page_ids(4) == [7, 8]
+
+    assert await page_ids(1, readonly=True) == [1, 2]
+    assert len(cache._entries) == 2
+
+    for bound, expected in ((2, [3, 4]), (4, [5, 6])):
+        page_items = await service.search(
+            Filter(Item.qty > bound), sorting, Pagination(1, 2), cache=cache
+        )
+        assert [i.id for i in page_items] == expected
+
+    async with AsyncSession(session.bind) as other:
+        with pytest.raises(Exception, match="another session"):
+            await ItemService(other).search(pagination=Pagination(), cache=cache)
+
+
+@with_session
+async def test_iter_search(session: AsyncSession):
+    service = ItemService(session)
+    await service.bulk_create(items(5))
+    sorting = Sorting().desc_(Item.id)
+
+    streamed = [i.id async for i in service.iter_search(sorting=sorting, yield_per=2)]
+    assert streamed == [5, 4, 3, 2, 1]
+
+    async for item in service.iter_search(Filter(Item.qty > 1), sorting):
+        assert item.id == 5
+        break
+    assert len(await service.search()) == 5
+
+
+@with_session
+async def test_search_readonly(session: AsyncSession):
+    service = ItemService(session)
+    await service.bulk_create(items(2))
+    held = await service.get_by_id(2)
+    assert held is not None
+    held.qty = 12345
+    session.add(Item(name="flushed", qty=0))
+    await session.flush()
+
+    rows = await service.search(readonly=True)
+    assert [i.name for i in rows] == ["item1", "item2", "flushed"]
+    assert all(i not in session for i in rows)
+    assert held in session
+
+    await session.commit()
+    reloaded = await service.search(Filter(Item.id == 2), readonly=True)
+    assert reloaded[0].qty == 12345